@@ -8,17 +8,27 @@ import os
 import sys
 import json
 import re
+import itertools
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, session
-from text_replacer import TextReplacer
+from text_replacer import TextReplacer, MAX_FILE_SIZE, detect_github_repo
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 
-# Global variable to store job status
-job_status = {}
+# Global job status store, guarded by job_status_lock; the least recently used
+# jobs are evicted past MAX_JOBS so a long-running server doesn't grow unbounded
+job_status = OrderedDict()
+job_status_lock = threading.Lock()
+MAX_JOBS = 1000
+
+_job_counter = itertools.count(1)
+
+# Seconds between progress updates while a job scans files
+PROGRESS_INTERVAL = 0.1
 
 class WebTextReplacer(TextReplacer):
   """Extended TextReplacer with web UI support."""
@@ -41,103 +51,104 @@ class WebTextReplacer(TextReplacer):
     if self.job_id and self.status_callback:
       self.status_callback(self.job_id, status, progress, details)
   
-  def find_files(self, pattern: str, file_extensions: list = None, 
-         max_files: int = 10000, exclude_dirs: list = None) -> list:
-    """Find files with progress updates."""
-    self.update_status("Searching files...", 10)
-    
-    matching_files = []
-    files_checked = 0
-    
-    if exclude_dirs is None:
-      exclude_dirs = ['.git', 'node_modules', 'dist', 'build', '.next', '__pycache__']
-    
-    # Get all files first
-    all_files = []
-    for file_path in self.directory.rglob('*'):
-      if file_path.is_file():
-        if any(part.startswith('.') for part in file_path.parts):
-          continue
-        if any(excluded in str(file_path) for excluded in exclude_dirs):
-          continue
-        if file_extensions and file_path.suffix not in file_extensions:
-          continue
-        all_files.append(file_path)
-        if len(all_files) >= max_files:
-          break
-    
-    total_files = len(all_files)
-    self.update_status(f"Scanning {total_files} files...", 20)
-    
-    for file_path in all_files:
-      files_checked += 1
-      progress = 20 + int((files_checked / total_files) * 60)
-      self.update_status(f"Checking file {files_checked}/{total_files}", progress)
-      
-      try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-          content = f.read()
-          if re.search(pattern, content, re.IGNORECASE):
-            matching_files.append(file_path)
-      except (UnicodeDecodeError, PermissionError):
-        continue
-    
-    self.update_status(f"Found {len(matching_files)} matching files", 80)
-    return matching_files
-  
-  def replace_text(self, search_pattern: str, replacement: str, 
+  def replace_text(self, search_pattern: str, replacement, 
           file_extensions: list = None, use_regex: bool = False,
           max_files: int = 10000, exclude_dirs: list = None, 
-          dry_run: bool = False) -> dict:
+          dry_run: bool = False, max_file_size: int = MAX_FILE_SIZE,
+          regex=None, header: bool = True) -> dict:
     """Replace text with progress updates."""
     self.update_status("Starting text replacement...", 0)
     
-    try:
-      matching_files = self.find_files(search_pattern, file_extensions, max_files, exclude_dirs)
-    except Exception as e:
-      self.update_status(f"Error during file search: {e}", 0, "error")
-      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
-    
-    if not matching_files:
-      self.update_status("No files found containing the search pattern", 100)
-      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
-    
-    self.update_status(f"Processing {len(matching_files)} files...", 80)
+    if regex is None:
+      try:
+        regex = self._compile_search(search_pattern, use_regex)
+      except re.error as e:
+        self.update_status(f"Invalid search pattern: {e}", 0, "error")
+        return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
     
     files_processed = 0
     total_replacements = 0
     files_changed = 0
+    self.skipped_files = []
     
-    for i, file_path in enumerate(matching_files):
-      progress = 80 + int((i / len(matching_files)) * 20)
-      self.update_status(f"Processing {file_path.name}...", progress)
-      
-      changed, count = self.replace_in_file(file_path, search_pattern, replacement, use_regex, dry_run)
-      files_processed += 1
+    try:
+      self.update_status("Scanning files...", 10)
       
-      if changed:
-        files_changed += 1
-        total_replacements += count
-        self.changes_made.append({
-          'file': str(file_path.relative_to(self.directory)),
-          'replacements': count
-        })
+      # Files are processed as the walk finds them, so the total isn't known up front;
+      # progress is measured against the max_files budget instead
+      base_len = len(os.path.join(str(self.directory), ''))
+      candidates = self._walk_files(file_extensions, max_files, exclude_dirs)
+      processed = self._process_files(candidates, search_pattern, replacement, use_regex, dry_run,
+                      regex, max_file_size)
+      # Report progress at most every PROGRESS_INTERVAL seconds rather than once per file
+      next_report = time.monotonic() + PROGRESS_INTERVAL
+      for files_checked, (file_path, result) in enumerate(processed, 1):
+        now = time.monotonic()
+        if now >= next_report:
+          next_report = now + PROGRESS_INTERVAL
+          # With no total to measure against, ease towards the end of the bar as files are
+          # checked, or follow the max_files budget if that is further along
+          share = max(files_checked / (files_checked + 100), files_checked / max(max_files, 1))
+          progress = 10 + int(min(share, 1) * 85)
+          self.update_status(f"Checked {files_checked} files", progress)
+        
+        if result is None:
+          continue
+        
+        changed, count = result
+        files_processed += 1
+        if changed:
+          files_changed += 1
+          total_replacements += count
+          self.changes_made.append({
+            'file': file_path[base_len:],
+            'replacements': count
+          })
+    except Exception as e:
+      self.update_status(f"Error during file search: {e}", 0, "error")
+      if not dry_run:
+        # Some files may already be rewritten, so report them and flag the run as incomplete
+        return {
+          "files_processed": files_processed,
+          "total_replacements": total_replacements,
+          "files_changed": files_changed,
+          "aborted": True
+        }
+      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
+    
+    # Oversized files are left out of the counts, so mention them in the final status
+    skipped = ''
+    if self.skipped_files:
+      skipped = f" (skipped {len(self.skipped_files)} file(s) larger than {max_file_size} bytes)"
+    
+    if not files_processed:
+      self.update_status(f"No files found containing the search pattern{skipped}", 100)
+      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
     
-    self.update_status("Text replacement completed!", 100)
+    self.update_status(f"Text replacement completed!{skipped}", 100)
     return {
       "files_processed": files_processed,
       "total_replacements": total_replacements,
       "files_changed": files_changed
     }
 
+def set_job_fields(job_id: str, **fields):
+  """Merge fields into a job's status entry under the lock."""
+  with job_status_lock:
+    job_status.setdefault(job_id, {}).update(fields)
+    job_status.move_to_end(job_id)
+    while len(job_status) > MAX_JOBS:
+      job_status.popitem(last=False)
+
 def update_job_status(job_id: str, status: str, progress: int = None, details: str = None):
   """Update job status in global dictionary."""
-  job_status[job_id] = {
-    'status': status,
-    'progress': progress or 0,
-    'details': details or '',
-    'timestamp': time.time()
-  }
+  set_job_fields(
+    job_id,
+    status=status,
+    progress=progress or 0,
+    details=details or '',
+    timestamp=time.time()
+  )
 
 def run_replacement_job(job_id: str, data: dict):
   """Run text replacement job in background thread."""
@@ -162,10 +173,10 @@ def run_replacement_job(job_id: str, data: dict):
         use_regex=data.get('use_regex', False),
         max_files=data.get('max_files', 10000),
         exclude_dirs=data.get('exclude_dirs'),
-        dry_run=True
+        dry_run=True,
+        max_file_size=data.get('max_file_size', MAX_FILE_SIZE)
       )
-      job_status[job_id]['result'] = result
-      job_status[job_id]['status'] = 'completed'
+      set_job_fields(job_id, result=result, status='completed')
     else:
       # Full workflow
       success = replacer.run_full_workflow(
@@ -178,14 +189,13 @@ def run_replacement_job(job_id: str, data: dict):
         pr_title=data.get('pr_title'),
         pr_description=data.get('pr_description'),
         max_files=data.get('max_files', 10000),
-        exclude_dirs=data.get('exclude_dirs')
+        exclude_dirs=data.get('exclude_dirs'),
+        max_file_size=data.get('max_file_size', MAX_FILE_SIZE)
       )
-      job_status[job_id]['result'] = {'success': success}
-      job_status[job_id]['status'] = 'completed' if success else 'failed'
+      set_job_fields(job_id, result={'success': success}, status='completed' if success else 'failed')
       
   except Exception as e:
-    job_status[job_id]['status'] = 'error'
-    job_status[job_id]['error'] = str(e)
+    set_job_fields(job_id, status='error', error=str(e))
 
 @app.route('/')
 def index():
@@ -197,31 +207,29 @@ def start_replacement():
   """Start text replacement job."""
   data = request.json
   
-  # Generate job ID
-  job_id = f"job_{int(time.time())}"
+  # Generate a unique job ID; the counter keeps jobs started in the same millisecond apart
+  job_id = f"job_{next(_job_counter)}_{int(time.time() * 1000)}"
+  
+  # Initialize job status before the thread starts so it can't overwrite the job's own updates
+  update_job_status(job_id, 'started', 0, 'Initializing...')
   
   # Start job in background thread
   thread = threading.Thread(target=run_replacement_job, args=(job_id, data))
   thread.daemon = True
   thread.start()
   
-  # Initialize job status
-  job_status[job_id] = {
-    'status': 'started',
-    'progress': 0,
-    'details': 'Initializing...',
-    'timestamp': time.time()
-  }
-  
   return jsonify({'job_id': job_id})
 
 @app.route('/api/status/<job_id>')
 def get_status(job_id):
   """Get job status."""
-  if job_id not in job_status:
-    return jsonify({'error': 'Job not found'}), 404
+  with job_status_lock:
+    if job_id not in job_status:
+      return jsonify({'error': 'Job not found'}), 404
+    job_status.move_to_end(job_id)
+    status = dict(job_status[job_id])
   
-  return jsonify(job_status[job_id])
+  return jsonify(status)
 
 @app.route('/api/validate-directory', methods=['POST'])
 def validate_directory():
@@ -240,15 +248,15 @@ def validate_directory():
   if not (path / '.git').exists():
     return jsonify({'valid': False, 'error': 'Directory is not a Git repository'})
   
-  # Try to detect GitHub repo
+  # Try to detect GitHub repo; cached so repeated validation doesn't re-run git
   try:
-    replacer = TextReplacer(str(path))
-    if replacer.repo_owner and replacer.repo_name:
+    repo_owner, repo_name = detect_github_repo(path)
+    if repo_owner and repo_name:
       return jsonify({
         'valid': True, 
-        'repo_info': f"{replacer.repo_owner}/{replacer.repo_name}",
-        'repo_owner': replacer.repo_owner,
-        'repo_name': replacer.repo_name
+        'repo_info': f"{repo_owner}/{repo_name}",
+        'repo_owner': repo_owner,
+        'repo_name': repo_name
       })
     else:
       return jsonify({'valid': True, 'repo_info': 'GitHub repo not detected'})
@@ -0,0 +1,49 @@
+"""
+Regression tests for the Text Replacer search prefilter.
+"""
+
+import os
+import re
+import tempfile
+import unittest
+from collections import defaultdict
+
+from text_replacer import TextReplacer, _is_fold_stable, _required_literal
+
+
+class RequiredLiteralTest(unittest.TestCase):
+  """The literal prefilter must never reject a file the regex would match."""
+  
+  def test_fold_stable_chars_keep_their_case_partners(self):
+    # Group code points by their lower and upper forms to find every case partner
+    partners = defaultdict(set)
+    for code in range(0x20, 0x20000):
+      char = chr(code)
+      partners[char.lower()].add(char)
+      partners[char.upper()].add(char)
+    
+    for code in range(0x20, 0x20000):
+      char = chr(code)
+      if not _is_fold_stable(char):
+        continue
+      pattern = re.compile(re.escape(char), re.IGNORECASE)
+      for other in partners[char.lower()] | partners[char.upper()]:
+        if pattern.fullmatch(other):
+          self.assertIn(char.casefold(), other.casefold(), f"{char!r} matches {other!r}")
+  
+  def test_dotted_and_dotless_i_are_not_required(self):
+    self.assertEqual(_required_literal('abİcd'), '')
+    self.assertEqual(_required_literal('abıcd'), '')
+  
+  def test_dotted_capital_i_pattern_matches_file(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'sample.txt')
+      with open(file_path, 'w', encoding='utf-8') as f:
+        f.write('abicd\nabıcd\n')
+      
+      replacer = TextReplacer(directory, repo_owner='owner', repo_name='repo')
+      self.assertEqual(replacer.process_file(file_path, 'abİcd', 'Q', use_regex=True, dry_run=True), (True, 2))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -5,13 +5,223 @@ A tool to find and replace text in files within a directory, create a Git branch
 
 import os
 import argparse
+import codecs
+import contextlib
+import functools
+import logging
+import mmap
 import subprocess
 import re
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import requests
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
+try:
+  from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+  import sre_parse
+
+# Directories skipped by the walk unless exclude_dirs is given
+DEFAULT_EXCLUDES = frozenset({'.git', 'node_modules', 'dist', 'build', '.next', '__pycache__'})
+
+# Files are sniffed for a NUL byte in this many leading bytes to detect binaries
+BINARY_SNIFF_SIZE = 8192
+
+# Files larger than this are skipped unless a different max_file_size is given
+MAX_FILE_SIZE = 50 * 1024 * 1024
+
+# Files at least this large are searched through mmap instead of being read into memory
+MMAP_THRESHOLD = 64 * 1024
+
+# Plain-text replacements in files at least this large are streamed in chunks of STREAM_CHUNK_SIZE
+STREAM_THRESHOLD = 4 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# File reads release the GIL, so I/O-bound scans benefit from more threads than cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# A replacement string, or for regex runs a function computing it from each match
+Replacement = Union[str, Callable[[re.Match], str]]
+
+# GitHub owner and repo name from an HTTPS or SSH remote URL
+_REMOTE_RE = re.compile(r'^(?:https://github\.com/|git@github\.com:)([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+_NON_ASCII_BYTE = re.compile(rb'[\x80-\xff]')
+
+_WHITESPACE_CLASS = re.compile(r'\\[sS]')
+
+
+def _is_fold_stable(char: str) -> bool:
+  """Return whether casefold() keeps a character and everything IGNORECASE matches to it together."""
+  return char not in 'iIıİ' and char.casefold() == char.lower() and len(char.lower()) == 1
+
+
+@functools.lru_cache(maxsize=128)
+def _required_literal(pattern: str) -> str:
+  """Return the longest literal run (casefolded) that every match of a regex must contain."""
+  try:
+    parsed = sre_parse.parse(pattern)
+  except re.error:
+    return ''
+  
+  # Only top-level literals are required; anything inside groups, repeats or
+  # alternations may be skipped. Runs are split at 'i', the dotless 'ı' and the dotted
+  # 'İ' because re's IGNORECASE matches them to each other while casefold() keeps them
+  # apart, and at any character whose casefold isn't the single code point lower() gives.
+  longest = run = ''
+  for op, av in parsed:
+    if op is sre_parse.LITERAL and _is_fold_stable(chr(av)):
+      run += chr(av)
+      if len(run) > len(longest):
+        longest = run
+    else:
+      run = ''
+  
+  return longest.casefold() if len(longest) >= 3 else ''
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_bytes_search(pattern: str, flags: int = re.IGNORECASE) -> Optional[re.Pattern]:
+  """Compile a regex for matching raw bytes, or return None if it can't mirror the text regex."""
+  # Non-ASCII patterns can match differently once content is encoded, so they need decoding
+  if not pattern.isascii():
+    return None
+  # A text \s also matches the \x1c-\x1f separators, which a bytes \s does not
+  if _WHITESPACE_CLASS.search(pattern):
+    return None
+  try:
+    return re.compile(pattern.encode('ascii'), flags)
+  except re.error:
+    # Text-only escapes such as \u or \N{...}
+    return None
+
+
+def _read_to_end(fd: int, size_hint: int) -> bytes:
+  """Read the rest of fd with raw os.read calls, sized by the bytes fstat says remain."""
+  chunks = []
+  while True:
+    want = size_hint + 1 if size_hint > 0 else BINARY_SNIFF_SIZE
+    chunk = os.read(fd, want)
+    if chunk:
+      chunks.append(chunk)
+    # A short read on a regular file means EOF, which saves the extra empty read
+    if len(chunk) < want:
+      return b''.join(chunks)
+    size_hint -= len(chunk)
+
+
+@contextlib.contextmanager
+def _atomic_writer(file_path: Union[str, Path]) -> Iterator[BinaryIO]:
+  """Yield a temp file in the same directory that replaces file_path via os.replace on success.
+  
+  The file is never left half-written if the process dies mid-write.
+  """
+  directory, name = os.path.split(file_path)
+  fd, tmp_name = tempfile.mkstemp(dir=directory or None, prefix=f".{name}.", suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as tmp:
+      yield tmp
+    # mkstemp creates the file as 0600, so carry over the original permissions
+    shutil.copymode(file_path, tmp_name)
+    os.replace(tmp_name, file_path)
+  except BaseException:
+    try:
+      os.unlink(tmp_name)
+    except OSError:
+      pass
+    raise
+
+
+def _write_atomic(file_path: Union[str, Path], data: bytes) -> None:
+  """Write data to a file atomically."""
+  with _atomic_writer(file_path) as tmp:
+    tmp.write(data)
+
+
+def _stream_replace(src: BinaryIO, search: str, replacement: str, dst: Optional[BinaryIO]) -> int:
+  """Replace a literal while streaming UTF-8 from src to dst (if given), returning the count.
+  
+  Only the last len(search) - 1 characters of each chunk, which could begin a match
+  straddling the next chunk, are carried over, so memory stays around the chunk size.
+  """
+  decoder = codecs.getincrementaldecoder('utf-8')()
+  keep = len(search) - 1
+  count = 0
+  carry = ''
+  
+  while True:
+    chunk = src.read(STREAM_CHUNK_SIZE)
+    final = not chunk
+    text = carry + decoder.decode(chunk, final)
+    
+    parts = []
+    pos = 0
+    while True:
+      i = text.find(search, pos)
+      if i == -1:
+        break
+      parts.append(text[pos:i])
+      parts.append(replacement)
+      pos = i + len(search)
+      count += 1
+    
+    tail = len(text) if final else max(pos, len(text) - keep)
+    parts.append(text[pos:tail])
+    carry = text[tail:]
+    if dst is not None:
+      dst.write(''.join(parts).encode('utf-8'))
+    
+    if final:
+      return count
+
+
+@functools.lru_cache(maxsize=128)
+def _detect_repo(directory: str, git_config_mtime: Optional[float]) -> Tuple[Optional[str], Optional[str]]:
+  """Run git to find the GitHub owner and name of a repository's origin remote.
+  
+  Cached on the directory and the mtime of its .git/config, which changes with the remote.
+  """
+  try:
+    # Get the remote URL
+    result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
+              cwd=directory, capture_output=True, text=True)
+    if result.returncode != 0:
+      print("Warning: Could not detect GitHub repository from git remote.")
+      return None, None
+    
+    remote_url = result.stdout.strip()
+    
+    # Parse HTTPS (https://github.com/owner/repo.git) and SSH (git@github.com:owner/repo.git) formats
+    match = _REMOTE_RE.match(remote_url)
+    if not match:
+      print(f"Warning: Unsupported remote URL format: {remote_url}")
+      return None, None
+    
+    print(f"Detected GitHub repository: {match.group(1)}/{match.group(2)}")
+    return match.group(1), match.group(2)
+    
+  except Exception as e:
+    print(f"Warning: Could not detect GitHub repository: {e}")
+  
+  return None, None
+
+
+def detect_github_repo(directory: Path) -> Tuple[Optional[str], Optional[str]]:
+  """Return the GitHub (owner, name) of a repository's origin remote, or (None, None)."""
+  try:
+    git_config_mtime = (directory / '.git' / 'config').stat().st_mtime
+  except OSError:
+    # No .git/config to key the cache on (e.g. a subdirectory or worktree), so ask git directly
+    return _detect_repo.__wrapped__(str(directory), None)
+  return _detect_repo(str(directory), git_config_mtime)
+
 
 class TextReplacer:
   def __init__(self, directory: str, github_token: str = None, repo_owner: str = None, repo_name: str = None):
@@ -21,6 +231,7 @@ class TextReplacer:
     self.repo_name = repo_name
     self.branch_name = None
     self.changes_made = []
+    self.skipped_files = []
     
     # Auto-detect GitHub repository info if not provided
     if not self.repo_owner or not self.repo_name:
@@ -28,36 +239,10 @@ class TextReplacer:
   
   def _detect_github_repo(self) -> None:
     """Auto-detect GitHub repository owner and name from git remote."""
-    try:
-      # Get the remote URL
-      result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
-                cwd=self.directory, capture_output=True, text=True)
-      if result.returncode != 0:
-        print("Warning: Could not detect GitHub repository from git remote.")
-        return
-      
-      remote_url = result.stdout.strip()
-      
-      # Parse different URL formats
-      if remote_url.startswith('https://github.com/'):
-        # HTTPS format: https://github.com/owner/repo.git
-        parts = remote_url.replace('https://github.com/', '').replace('.git', '').split('/')
-        if len(parts) >= 2:
-          self.repo_owner = parts[0]
-          self.repo_name = parts[1]
-          print(f"Detected GitHub repository: {self.repo_owner}/{self.repo_name}")
-      elif remote_url.startswith('git@github.com:'):
-        # SSH format: git@github.com:owner/repo.git
-        parts = remote_url.replace('git@github.com:', '').replace('.git', '').split('/')
-        if len(parts) >= 2:
-          self.repo_owner = parts[0]
-          self.repo_name = parts[1]
-          print(f"Detected GitHub repository: {self.repo_owner}/{self.repo_name}")
-      else:
-        print(f"Warning: Unsupported remote URL format: {remote_url}")
-        
-    except Exception as e:
-      print(f"Warning: Could not detect GitHub repository: {e}")
+    repo_owner, repo_name = detect_github_repo(self.directory)
+    if repo_owner and repo_name:
+      self.repo_owner = repo_owner
+      self.repo_name = repo_name
   
   def _get_current_branch(self) -> str:
     """Get the current branch name."""
@@ -82,138 +267,302 @@ class TextReplacer:
       
     return True
   
-  def find_files(self, pattern: str, file_extensions: List[str] = None, 
-         max_files: int = 10000, exclude_dirs: List[str] = None) -> List[Path]:
-    """Find files containing the search pattern."""
-    matching_files = []
-    files_checked = 0
-    
-    if exclude_dirs is None:
-      exclude_dirs = ['.git', 'node_modules', 'dist', 'build', '.next', '__pycache__']
-    
-    # Get all files first
-    all_files = []
-    for file_path in self.directory.rglob('*'):
-      if file_path.is_file():
-        # Skip .git directory and other hidden directories
-        if any(part.startswith('.') for part in file_path.parts):
+  def _walk_files(self, file_extensions: List[str] = None, max_files: int = 10000,
+          exclude_dirs: List[str] = None) -> Iterator[str]:
+    """Yield candidate file paths lazily from an os.scandir walk of the directory.
+    
+    Paths are plain strings from DirEntry.path, so no Path object is built per file.
+    """
+    exclude_set = DEFAULT_EXCLUDES if exclude_dirs is None else frozenset(exclude_dirs)
+    ext_set = frozenset(file_extensions) if file_extensions else None
+    
+    files_found = 0
+    pending = deque([str(self.directory)])
+    while pending:
+      try:
+        with os.scandir(pending.pop()) as it:
+          entries = list(it)
+      except OSError:
+        # Skip directories we can't list
+        continue
+      
+      for entry in entries:
+        # Skip .git directory and other hidden files and directories
+        if entry.name.startswith('.'):
           continue
         
-        # Skip excluded directories
-        if any(excluded in str(file_path) for excluded in exclude_dirs):
+        # DirEntry type checks use the cached d_type, so no extra stat() per entry
+        if entry.is_dir(follow_symlinks=False):
+          # Prune excluded directories so their contents are never listed
+          if entry.name not in exclude_set:
+            pending.append(entry.path)
+          continue
+        if not entry.is_file(follow_symlinks=False):
           continue
-          
+        
         # Filter by file extensions if specified
-        if file_extensions and file_path.suffix not in file_extensions:
+        if ext_set and os.path.splitext(entry.name)[1] not in ext_set:
           continue
-          
-        all_files.append(file_path)
+        
+        yield entry.path
+        files_found += 1
         
         # Limit number of files to prevent hanging on very large repos
-        if len(all_files) >= max_files:
+        if files_found >= max_files:
           print(f"⚠️  Reached maximum file limit ({max_files}). Use --max-files to increase limit.")
-          break
+          return
+  
+  def _compile_search(self, pattern: str, use_regex: bool = False) -> re.Pattern:
+    """Compile the case-insensitive search regex once for a whole run."""
+    return re.compile(pattern if use_regex else re.escape(pattern), re.IGNORECASE)
+  
+  def _match_bytes(self, buf, search_pattern: str, use_regex: bool,
+           regex: re.Pattern) -> Optional[bool]:
+    """Match the raw bytes of a file (bytes or mmap) where that is exact.
     
-    total_files = len(all_files)
-    print(f"Scanning {total_files} files for pattern...")
+    Returns None when only the decoded text can decide, so non-matching files are never decoded.
+    """
+    if not use_regex:
+      # Plain text is replaced case-sensitively, so a substring test on the UTF-8 bytes is exact
+      return buf.find(search_pattern.encode('utf-8')) != -1
     
-    for file_path in all_files:
-      files_checked += 1
-      
-      # Show progress every 100 files
-      if files_checked % 100 == 0 or files_checked == total_files:
-        print(f"  Progress: {files_checked}/{total_files} files checked...")
-      
-      try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-          content = f.read()
-          if re.search(pattern, content, re.IGNORECASE):
-            matching_files.append(file_path)
-      except (UnicodeDecodeError, PermissionError):
-        # Skip binary files or files we can't read
-        continue
-          
-    return matching_files
+    regex_b = _compile_bytes_search(regex.pattern, regex.flags & re.IGNORECASE)
+    if regex_b is None:
+      return None
+    
+    # ASCII content matches the bytes regex exactly as it would the text regex
+    if isinstance(buf, bytes):
+      if not buf.isascii():
+        return None
+      literal = _required_literal(regex.pattern)
+      if literal and literal.encode('utf-8') not in buf.lower():
+        return False
+    elif _NON_ASCII_BYTE.search(buf):
+      return None
+    
+    return regex_b.search(buf) is not None
   
-  def replace_in_file(self, file_path: Path, search_pattern: str, replacement: str, 
-           use_regex: bool = False, dry_run: bool = False) -> Tuple[bool, int]:
-    """Replace text in a single file."""
+  def process_file(self, file_path: Union[str, Path], search_pattern: str, replacement: Replacement,
+           use_regex: bool = False, dry_run: bool = False, regex: re.Pattern = None,
+           max_file_size: Optional[int] = MAX_FILE_SIZE) -> Optional[Tuple[bool, int]]:
+    """Search a single file and replace text in it, reading it only once.
+    
+    Returns None if the file does not contain the pattern, otherwise (changed, count).
+    """
+    if regex is None:
+      regex = self._compile_search(search_pattern, use_regex)
+    
     try:
-      with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+      # Raw fd reads skip the BufferedReader allocation and its extra seek/isatty calls
+      fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+      try:
+        size = os.fstat(fd).st_size
+        if max_file_size is not None and size > max_file_size:
+          self.skipped_files.append(str(file_path))
+          return None
         
-      original_content = content
-      
+        # Skip binary files, detected by a NUL byte in the header as grep and git do
+        head = os.read(fd, BINARY_SNIFF_SIZE)
+        if b'\x00' in head:
+          return None
+        
+        stream = False
+        if size < MMAP_THRESHOLD:
+          if len(head) < BINARY_SNIFF_SIZE:
+            data = head
+          else:
+            data = head + _read_to_end(fd, size - len(head))
+          matched = self._match_bytes(data, search_pattern, use_regex, regex)
+          if matched is False:
+            return None
+        else:
+          # Search large files straight from the page cache and only copy them out on a match
+          with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            matched = self._match_bytes(mm, search_pattern, use_regex, regex)
+            if matched is False:
+              return None
+            
+            # Large plain-text files are rewritten in chunks instead of being copied out whole
+            stream = not use_regex and bool(search_pattern) and size >= STREAM_THRESHOLD
+            if not stream:
+              data = mm[:]
+      finally:
+        os.close(fd)
+    except (OSError, ValueError):
+      # Skip files we can't read or map
+      return None
+    
+    if stream:
+      return self._replace_streaming(file_path, search_pattern, replacement, dry_run)
+    
+    try:
+      original_content = data.decode('utf-8')
+    except UnicodeDecodeError:
+      # Skip binary files
+      return None
+    
+    if matched is None:
+      # Cheap substring test first; only run the regex when the required literal is present
+      literal = _required_literal(regex.pattern)
+      if literal and literal not in original_content.casefold():
+        return None
+      if not regex.search(original_content):
+        return None
+    
+    try:
+      # Substitute and count in a single pass over the content
       if use_regex:
-        content = re.sub(search_pattern, replacement, content, flags=re.IGNORECASE)
+        content, count = regex.subn(replacement, original_content)
       else:
-        content = content.replace(search_pattern, replacement)
+        count = original_content.count(search_pattern)
+        content = original_content.replace(search_pattern, replacement)
       
-      if content != original_content:
-        if not dry_run:
-          with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        # Count occurrences
-        count = len(re.findall(re.escape(search_pattern), original_content, re.IGNORECASE))
-        return True, count
-      else:
+      if content == original_content:
         return False, 0
-        
+      
+      if not dry_run:
+        _write_atomic(file_path, content.encode('utf-8'))
+      
+      return True, count
+      
     except Exception as e:
       print(f"Error processing {file_path}: {e}")
       return False, 0
   
-  def replace_text(self, search_pattern: str, replacement: str, 
-          file_extensions: List[str] = None, use_regex: bool = False,
-          max_files: int = 10000, exclude_dirs: List[str] = None, 
-          dry_run: bool = False) -> Dict:
-    """Replace text in all matching files."""
-    print(f"Searching for pattern: '{search_pattern}'")
-    print(f"Replacement: '{replacement}'")
-    print(f"File extensions: {file_extensions or 'All'}")
-    print(f"Use regex: {use_regex}")
-    print("-" * 50)
+  def _replace_streaming(self, file_path: Union[str, Path], search_pattern: str, replacement: str,
+              dry_run: bool = False) -> Optional[Tuple[bool, int]]:
+    """Replace plain text in a large file chunk by chunk, without holding it in memory."""
+    if replacement == search_pattern:
+      return False, 0
     
     try:
-      # Find files containing the pattern
-      matching_files = self.find_files(search_pattern, file_extensions, max_files, exclude_dirs)
-    except KeyboardInterrupt:
-      print("\n⚠️  Search interrupted by user. Exiting...")
-      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
+      with contextlib.ExitStack() as stack:
+        # The source is closed before the temp file replaces it
+        dst = None if dry_run else stack.enter_context(_atomic_writer(file_path))
+        with open(file_path, 'rb') as src:
+          count = _stream_replace(src, search_pattern, replacement, dst)
+    except UnicodeDecodeError:
+      # Skip binary files
+      return None
     except Exception as e:
-      print(f"❌ Error during file search: {e}")
-      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
+      print(f"Error processing {file_path}: {e}")
+      return False, 0
     
-    if not matching_files:
-      print("No files found containing the search pattern.")
-      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
+    return (True, count) if count else (False, 0)
+  
+  def _process_files(self, files: Iterable[str], search_pattern: str, replacement: Replacement,
+            use_regex: bool, dry_run: bool, regex: re.Pattern,
+            max_file_size: Optional[int]) -> Iterator[Tuple[str, Optional[Tuple[bool, int]]]]:
+    """Run process_file over files on a thread pool, yielding (file_path, result) in order.
     
-    print(f"Found {len(matching_files)} files containing the pattern:")
-    for file_path in matching_files:
-      print(f"  - {file_path.relative_to(self.directory)}")
-    print("-" * 50)
+    Only a bounded window of files is submitted ahead, so a lazy walk is consumed as
+    results are yielded rather than being drained up front.
+    """
+    def process(file_path: str) -> Optional[Tuple[bool, int]]:
+      return self.process_file(file_path, search_pattern, replacement, use_regex, dry_run,
+                   regex, max_file_size)
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+      pending = deque()
+      try:
+        for file_path in files:
+          pending.append((file_path, executor.submit(process, file_path)))
+          if len(pending) >= MAX_WORKERS * 4:
+            file_path, future = pending.popleft()
+            yield file_path, future.result()
+        
+        while pending:
+          file_path, future = pending.popleft()
+          yield file_path, future.result()
+      finally:
+        # Cancel files that haven't started yet if the caller stops early
+        for _, future in pending:
+          future.cancel()
+  
+  def replace_text(self, search_pattern: str, replacement: Replacement, 
+          file_extensions: List[str] = None, use_regex: bool = False,
+          max_files: int = 10000, exclude_dirs: List[str] = None, 
+          dry_run: bool = False, max_file_size: Optional[int] = MAX_FILE_SIZE,
+          regex: re.Pattern = None, header: bool = True) -> Dict:
+    """Replace text in all matching files; header=False leaves the run description to the caller."""
+    if header:
+      print(f"Searching for pattern: '{search_pattern}'")
+      if isinstance(replacement, str):
+        print(f"Replacement: '{replacement}'")
+      print(f"File extensions: {file_extensions or 'All'}")
+      print(f"Use regex: {use_regex}")
+      print("-" * 50)
+    
+    if regex is None:
+      try:
+        regex = self._compile_search(search_pattern, use_regex)
+      except re.error as e:
+        print(f"❌ Invalid search pattern: {e}")
+        return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
     
-    # Process each file
     files_processed = 0
     total_replacements = 0
     files_changed = 0
+    aborted = False
+    self.skipped_files = []
     
-    for file_path in matching_files:
-      print(f"Processing: {file_path.relative_to(self.directory)}")
-      changed, count = self.replace_in_file(file_path, search_pattern, replacement, use_regex, dry_run)
-      
-      files_processed += 1
-      if changed:
-        files_changed += 1
-        total_replacements += count
-        self.changes_made.append({
-          'file': str(file_path.relative_to(self.directory)),
-          'replacements': count
-        })
-        print(f"  ✓ Made {count} replacement(s) in {file_path.relative_to(self.directory)}")
-      else:
-        print(f"  - No changes needed in {file_path.relative_to(self.directory)}")
+    # Walked paths are strings under the directory, so slicing off its prefix gives the relative path
+    base_len = len(os.path.join(str(self.directory), ''))
+    
+    try:
+      print("Scanning files for pattern...")
+      
+      # Search and replace each file in a single pass as the walk finds it, spread over a thread pool
+      candidates = self._walk_files(file_extensions, max_files, exclude_dirs)
+      processed = self._process_files(candidates, search_pattern, replacement, use_regex, dry_run,
+                      regex, max_file_size)
+      for files_checked, (file_path, result) in enumerate(processed, 1):
+        # Show progress every 100 files
+        if files_checked % 100 == 0:
+          print(f"  Progress: {files_checked} files checked...")
+        
+        if result is None:
+          continue
+        
+        changed, count = result
+        files_processed += 1
+        rel_path = file_path[base_len:]
+        if changed:
+          files_changed += 1
+          total_replacements += count
+          self.changes_made.append({
+            'file': rel_path,
+            'replacements': count
+          })
+          print(f"  ✓ Made {count} replacement(s) in {rel_path}")
+        else:
+          print(f"  - No changes needed in {rel_path}")
+    except KeyboardInterrupt:
+      print("\n⚠️  Search interrupted by user.")
+      aborted = True
+    except Exception as e:
+      print(f"❌ Error during file search: {e}")
+      aborted = True
+    
+    if self.skipped_files:
+      print(f"⚠️  Skipped {len(self.skipped_files)} file(s) larger than {max_file_size} bytes. Raise max_file_size to include them:")
+      for file_path in sorted(self.skipped_files):
+        print(f"  - {file_path[base_len:]}")
+    
+    if aborted and not dry_run:
+      # Files are rewritten as the walk finds them, including some still in flight when it
+      # stopped, so flag the partial run rather than letting it pass for a complete one
+      print(f"⚠️  Replacement stopped partway; {files_changed} file(s) were already rewritten.")
+      return {
+        "files_processed": files_processed,
+        "total_replacements": total_replacements,
+        "files_changed": files_changed,
+        "aborted": True
+      }
+    
+    if not files_processed:
+      print("No files found containing the search pattern.")
+      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
     
     print("-" * 50)
     print(f"Summary: {files_processed} files processed, {files_changed} files changed, {total_replacements} total replacements")
@@ -224,6 +573,38 @@ class TextReplacer:
       "files_changed": files_changed
     }
   
+  def replace_text_multi(self, pairs: List[Tuple[str, str]], file_extensions: List[str] = None,
+              max_files: int = 10000, exclude_dirs: List[str] = None,
+              dry_run: bool = False, max_file_size: Optional[int] = MAX_FILE_SIZE) -> Dict:
+    """Replace several literal search terms in one walk, with a single pass over each file."""
+    replacements = {search: replace for search, replace in pairs if search}
+    if not replacements:
+      print("No search terms given.")
+      return {"files_processed": 0, "total_replacements": 0, "files_changed": 0}
+    
+    # One alternation matches every term at once; longest terms go first so that
+    # overlapping terms resolve to the longest match at each position
+    search_pattern = '|'.join(re.escape(search) for search in sorted(replacements, key=len, reverse=True))
+    regex = re.compile(search_pattern)
+    
+    # Describe the terms themselves rather than the escaped alternation built from them
+    print(f"Replacing {len(replacements)} search terms:")
+    for search, replace in replacements.items():
+      print(f"  '{search}' -> '{replace}'")
+    print(f"File extensions: {file_extensions or 'All'}")
+    print("-" * 50)
+    
+    return self.replace_text(search_pattern, lambda match: replacements[match.group()], file_extensions,
+                 True, max_files, exclude_dirs, dry_run, max_file_size, regex, header=False)
+  
+  def _has_staged_changes(self) -> bool:
+    """Check the index for staged changes with an exit-code-only diff."""
+    # --quiet exits with 1 when there are changes; anything else but 0 is a git failure
+    result = subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=self.directory)
+    if result.returncode not in (0, 1):
+      raise subprocess.CalledProcessError(result.returncode, result.args)
+    return result.returncode == 1
+  
   def create_branch(self, branch_name: str = None, interactive: bool = True) -> bool:
     """Create a new Git branch."""
     if not branch_name:
@@ -252,18 +633,15 @@ class TextReplacer:
         else:
           print("Proceeding to create a new branch for your changes...")
       
-      # Check if we're on a clean working directory
-      result = subprocess.run(['git', 'status', '--porcelain'], 
-                cwd=self.directory, capture_output=True, text=True)
+      # Check if we're on a clean working directory; a clean tree needs no further git calls
+      result = subprocess.run(['git', 'status', '--porcelain', '-z'], 
+                cwd=self.directory, capture_output=True, check=True)
       
-      if result.stdout.strip():
+      if result.stdout:
         print("Working directory has uncommitted changes. Committing them first...")
         subprocess.run(['git', 'add', '.'], cwd=self.directory, check=True)
         
-        # Check if there are staged changes before committing
-        staged_result = subprocess.run(['git', 'diff', '--cached', '--name-only'], 
-                      cwd=self.directory, capture_output=True, text=True)
-        if staged_result.stdout.strip():
+        if self._has_staged_changes():
           subprocess.run(['git', 'commit', '-m', 'Auto-commit before text replacement'], 
                 cwd=self.directory, check=True)
         else:
@@ -291,34 +669,19 @@ class TextReplacer:
       commit_message = f"Replace text: {len(self.changes_made)} files modified"
     
     try:
-      print(f"Attempting to commit with message: {commit_message}")
-      
-      # Check if there are any changes to commit
-      result = subprocess.run(['git', 'status', '--porcelain'], 
-                cwd=self.directory, capture_output=True, text=True)
-      
-      print(f"Git status before add: {result.stdout}")
-      
-      if not result.stdout.strip():
-        print("No changes to commit.")
-        return True
+      log.debug("Attempting to commit with message: %s", commit_message)
       
       # Add all changes
-      print("Adding all changes to git...")
+      log.debug("Adding all changes to git...")
       subprocess.run(['git', 'add', '.'], cwd=self.directory, check=True)
       
       # Check if there are staged changes
-      result = subprocess.run(['git', 'diff', '--cached', '--name-only'], 
-                cwd=self.directory, capture_output=True, text=True)
-      
-      print(f"Staged changes: {result.stdout}")
-      
-      if not result.stdout.strip():
-        print("No staged changes to commit.")
+      if not self._has_staged_changes():
+        print("No changes to commit.")
         return True
       
       # Commit changes
-      print("Committing changes...")
+      log.debug("Committing changes...")
       subprocess.run(['git', 'commit', '-m', commit_message], cwd=self.directory, check=True)
       print(f"Committed changes: {commit_message}")
       return True
@@ -362,24 +725,31 @@ class TextReplacer:
   def _verify_changes(self) -> bool:
     """Verify that actual changes were made to files."""
     try:
-      # Check if there are any changes in the working directory
-      result = subprocess.run(['git', 'status', '--porcelain'], 
-                cwd=self.directory, capture_output=True, text=True)
+      # Check if there are any changes in the working directory; -z gives NUL-separated
+      # entries with paths unquoted, so names with spaces or newlines parse correctly
+      result = subprocess.run(['git', 'status', '--porcelain', '-z'], 
+                cwd=self.directory, capture_output=True)
       
-      print(f"Git status output: {result.stdout}")
+      log.debug("Git status output: %r", result.stdout)
       
-      if not result.stdout.strip():
-        print("No changes detected in git status")
+      if not result.stdout:
+        log.debug("No changes detected in git status")
         return False
       
-      # Check if there are actual file modifications
+      # Check if there are actual file modifications, staged or not
       modified_files = []
-      for line in result.stdout.strip().split('\n'):
-        print(f"Git status line: {line}")
-        if line.startswith('M ') or line.startswith(' A'):  # Modified or added files
-          modified_files.append(line[2:].strip())
-      
-      print(f"Modified files found: {len(modified_files)}")
+      entries = iter(result.stdout.split(b'\x00'))
+      for entry in entries:
+        if not entry:
+          continue
+        status, path = entry[:2].decode('ascii'), entry[3:]
+        if 'R' in status or 'C' in status:
+          # Renames and copies are followed by their original path
+          next(entries, None)
+        if 'M' in status or 'A' in status:  # Modified or added files
+          modified_files.append(os.fsdecode(path))
+      
+      log.debug("Modified files found: %d", len(modified_files))
       return len(modified_files) > 0
       
     except Exception as e:
@@ -443,7 +813,8 @@ This PR contains automated text replacements across {len(self.changes_made)} fil
             file_extensions: List[str] = None, use_regex: bool = False,
             branch_name: str = None, commit_message: str = None,
             pr_title: str = None, pr_description: str = None,
-            max_files: int = 10000, exclude_dirs: List[str] = None) -> bool:
+            max_files: int = 10000, exclude_dirs: List[str] = None,
+            max_file_size: Optional[int] = MAX_FILE_SIZE) -> bool:
     """Run the complete workflow: replace text, create branch, commit, push, and create PR."""
     
     print("🚀 Starting Text Replacement Workflow")
@@ -458,7 +829,13 @@ This PR contains automated text replacements across {len(self.changes_made)} fil
       return False
     
     # Replace text
-    result = self.replace_text(search_pattern, replacement, file_extensions, use_regex, max_files, exclude_dirs, dry_run=False)
+    result = self.replace_text(search_pattern, replacement, file_extensions, use_regex, max_files, exclude_dirs,
+                   dry_run=False, max_file_size=max_file_size)
+    
+    if result.get("aborted"):
+      # Switching back would carry the rewritten files along, so leave them on the new branch
+      print(f"Replacement did not finish. Partial changes are left uncommitted on branch {self.branch_name}.")
+      return False
     
     if result["files_changed"] == 0:
       print("No changes were made. Exiting workflow.")